@@ -3,15 +3,20 @@ import argparse
 import json
 import os
 import sys
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import datetime, timedelta, timezone
-from functools import total_ordering
+from functools import cache
 from pathlib import Path
 from typing import Any, Self, Literal
 
 import requests
 from simple_term_menu import TerminalMenu
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib codec if orjson is not available
+    orjson = None
+
 # Script directory for state files
 DATA_DIR = Path(__file__).resolve().parent / "data"
 CONFIG_FILE = DATA_DIR / "toggl_config.json"
@@ -19,6 +24,7 @@ STATE_FILE = DATA_DIR / "toggl_state.json"
 
 # Toggl API v9 base URL
 TOGGL_API_BASE_URL = "https://api.track.toggl.com/api/v9"
+TOGGL_API_TIMEOUT = (5, 30)  # (connect, read) timeouts in seconds
 
 DEFAULT_CLIENT = "Lunatech"  # Default client name, should come last when sorting
 
@@ -27,7 +33,6 @@ DEFAULT_CLIENT = "Lunatech"  # Default client name, should come last when sortin
 
 
 @dataclass
-@total_ordering
 class Project:
     id: int
     name: str
@@ -39,7 +44,8 @@ class Project:
     def _get_sort_key(self) -> tuple:
         """
         Generates a sort key for the project based on client and name.
-        The key respects the custom order: Regular Clients < DEFAULT_CLIENT < None.
+        The key respects the custom order: Regular Clients < DEFAULT_CLIENT < None,
+        and projects of the same client are ordered by name. Use it as `key=` when sorting.
         """
         if self.client is None:
             client_rank = 2
@@ -50,14 +56,6 @@ class Project:
 
         return client_rank, self.client, self.name
 
-    def __lt__(self, other: Self) -> bool:
-        """
-        Define custom ordering for projects:
-        1. First by client (lexicographically), but DEFAULT_CLIENT comes last and None at the very end
-        2. For the same client, order by name lexicographically
-        """
-        return self._get_sort_key() < other._get_sort_key()
-
     def __str__(self) -> str:
         """
         Returns a string representation of the project including name, client, and alias if they exist.
@@ -78,6 +76,20 @@ class Config:
     # Store projects indexed by their ID for easier merging/lookup
     projects: dict[int, Project] = field(default_factory=dict)
     default_project_id: int | None = None
+    # Lookup indexes (project IDs by alias / lowercased name), private so they aren't serialized
+    _alias_index: dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _name_index: dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Builds the alias and name lookup indexes used by get_project."""
+        for project in self.projects.values():
+            if project.alias:
+                self._alias_index.setdefault(project.alias, project.id)
+            self._name_index.setdefault(project.name.lower(), project.id)
 
     def get_project(self, selector: str) -> Project | None:
         """Get a project by alias or name."""
@@ -89,12 +101,10 @@ class Config:
                 print("Error: No default project set.", file=sys.stderr)
             return default_project
 
-        for project in self.projects.values():
-            alias_matches = project.alias and project.alias == selector
-            name_matches = project.name.lower() == selector.lower()
-            if alias_matches or name_matches:
-                return project
-        return None
+        project_id = self._alias_index.get(selector)
+        if project_id is None:
+            project_id = self._name_index.get(selector.lower())
+        return self.projects.get(project_id)
 
     def _get_default_project(self) -> Project | None:
         return self.projects.get(self.default_project_id) if self.default_project_id else None
@@ -103,6 +113,30 @@ class Config:
 # --- Helper Functions ---
 
 
+def _json_loads(data: bytes) -> Any:
+    """Decodes JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dataclass_to_dict(obj: Any) -> dict[str, Any]:
+    """Stdlib JSON encoder hook converting a dataclass to a dict of its public fields."""
+    if not is_dataclass(obj) or isinstance(obj, type):
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return {f.name: getattr(obj, f.name) for f in fields(obj) if not f.name.startswith("_")}
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Encodes data (dataclasses included) as indented JSON bytes, using orjson when available.
+    orjson encodes dataclasses natively, keeping their fields in declaration order."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, indent=2, sort_keys=True, default=_dataclass_to_dict).encode()
+
+
 def _get_api_token() -> str:
     """Retrieves the Toggl API token from the environment variable."""
     token = os.environ.get("TOGGL_API_TOKEN")
@@ -112,21 +146,26 @@ def _get_api_token() -> str:
     return token
 
 
+@cache
+def _get_session() -> requests.Session:
+    """Returns an authenticated session shared by all API calls so connections are reused."""
+    session = requests.Session()
+    session.auth = (_get_api_token(), "api_token")
+    session.headers.update({"Content-Type": "application/json", "Accept": "application/json"})
+    return session
+
+
 def _make_request(method: str, endpoint: str, data: dict[str, Any] | None = None) -> Any:
     """Makes an authenticated request to the Toggl API."""
-    token = _get_api_token()
     url = f"{TOGGL_API_BASE_URL}{endpoint}"
-    headers = {"Content-Type": "application/json"}
     try:
-        response = requests.request(
-            method, url, auth=(token, "api_token"), headers=headers, json=data
-        )
+        response = _get_session().request(method, url, json=data, timeout=TOGGL_API_TIMEOUT)
         response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
         # Handle potential empty responses for certain actions (like stopping a timer)
         if response.status_code == 200 and response.text:
             # Check if response content type is JSON before attempting to parse
             if "application/json" in response.headers.get("Content-Type", ""):
-                return response.json()
+                return _json_loads(response.content)
             else:
                 # Handle non-JSON 200 responses if necessary, or return None/True
                 # print(f"Warning: Received non-JSON response for {method} {endpoint}", file=sys.stderr)
@@ -139,7 +178,7 @@ def _make_request(method: str, endpoint: str, data: dict[str, Any] | None = None
         print(f"API Request Error ({method} {url}): {e}", file=sys.stderr)
         if hasattr(e, "response") and e.response is not None:
             try:
-                error_details = e.response.json()
+                error_details = _json_loads(e.response.content)
                 print(f"API Error Details: {error_details}", file=sys.stderr)
             except json.JSONDecodeError:
                 print(f"API Error Content: {e.response.text}", file=sys.stderr)
@@ -152,8 +191,7 @@ def _make_request(method: str, endpoint: str, data: dict[str, Any] | None = None
 def _load_json(filepath: Path) -> Any:
     """Loads JSON data from a file, returning None in case of error."""
     try:
-        with open(filepath, "r") as f:
-            return json.load(f)
+        return _json_loads(filepath.read_bytes())
     except FileNotFoundError:
         return None
     except json.JSONDecodeError:
@@ -170,8 +208,7 @@ def _load_json(filepath: Path) -> Any:
 def _save_json(filepath: Path, data: Any) -> None:
     """Saves data to a JSON file."""
     try:
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=4)
+        filepath.write_bytes(_json_dumps(data))
     except IOError as e:
         print(f"Error writing file {filepath}: {e}", file=sys.stderr)
         sys.exit(1)
@@ -193,7 +230,7 @@ def _load_config() -> Config:
         # Return an empty Config object if the config file doesn't exist
         return Config()
 
-    # Reconstruct Project objects within the projects dictionary
+    # Reconstruct Project objects within the projects dictionary (JSON object keys are strings)
     projects_data = data.get("projects", {})
     reconstructed_projects = {int(pid): Project(**pdata) for pid, pdata in projects_data.items()}
     data["projects"] = reconstructed_projects
@@ -203,7 +240,7 @@ def _load_config() -> Config:
 def _save_config(config: Config) -> None:
     """Saves the configuration to the JSON file."""
     _ensure_data_dir()
-    _save_json(CONFIG_FILE, asdict(config))
+    _save_json(CONFIG_FILE, config)
 
 
 def _get_current_utc_time() -> datetime:
@@ -264,7 +301,8 @@ def _fetch_projects() -> list[Project]:
             if p["active"] and not p["is_private"]
         ]
         print(f"Fetched {len(projects)} projects for the selected workspace.")
-        projects.sort()  # Sort projects using the custom ordering defined in Project class
+        # Sort by the custom project ordering, computing each key only once
+        projects.sort(key=Project._get_sort_key)
         return projects
     else:
         print("No projects data found in /me response or projects list is null.")
@@ -285,25 +323,36 @@ def handle_init() -> None:
     print("Setup complete. Configuration updated from /me endpoint and saved to toggl_config.json")
 
 
+def _compute_shortcut(index: int) -> str:
+    """Converts a numeric index to display character (0-9, a-p, r-z)."""
+
+    def shortcut_from_char(char: str) -> str:
+        return f"[{char}] " if char else ""
+
+    if index < 10:
+        return shortcut_from_char(str(index))  # 0-9 remain as numbers
+    index = index - 10 + ord("a")
+    if index >= ord("q"):
+        index += 1  # Skip 'q' which is reserved for quitting
+    if index < ord("z"):
+        return shortcut_from_char(chr(index))
+    return ""  # No shortcut for very large indices
+
+
+# Menu shortcuts precomputed per index; indices beyond the table get no shortcut
+_SHORTCUTS: tuple[str, ...] = tuple(_compute_shortcut(i) for i in range(36))
+
+
 @dataclass
 class ProjectMenu:
     projects: list[Project]
     default_project_id: int | None = None
+    # Project selection menu entries, built on first display and refreshed per edited row
+    _menu_entries: list[str | None] | None = field(default=None, init=False, repr=False)
 
     def _shortcut_for_index(self, index: int) -> str:
-        """Converts a numeric index to display character (0-9, a-p, r-z)."""
-
-        def shortcut_from_char(char: str) -> str:
-            return f"[{char}] " if char else ""
-
-        if index < 10:
-            return shortcut_from_char(str(index))  # 0-9 remain as numbers
-        index = index - 10 + ord("a")
-        if index >= ord("q"):
-            index += 1  # Skip 'q' which is reserved for quitting
-        if index < ord("z"):
-            return shortcut_from_char(chr(index))
-        return ""  # No shortcut for very large indices
+        """Returns the menu shortcut prefix for a project index ("" if it has none)."""
+        return _SHORTCUTS[index] if index < len(_SHORTCUTS) else ""
 
     def _project_menu_str(self, project_index: int) -> str:
         """Generates a string for the project menu item."""
@@ -315,6 +364,11 @@ class ProjectMenu:
         project_str += str(project)
         return project_str
 
+    def _refresh_menu_entry(self, project_index: int) -> None:
+        """Re-renders the cached selection menu entry for the given project index."""
+        if self._menu_entries is not None:
+            self._menu_entries[project_index] = self._project_menu_str(project_index)
+
     def _make_config(self) -> Config:
         """Creates a Config object from the current project list and default project ID."""
         return Config(
@@ -385,20 +439,27 @@ class ProjectMenu:
             selected_project.alias = None
             print(f"Alias removed for '{selected_project}'.")
         elif choice == "d":  # Set as Default
+            old_default_id = self.default_project_id
             self.default_project_id = selected_project.id
             print(f"'{selected_project.name}' is now the default project.")
+            # The previous default project's entry loses its [DEFAULT] marker
+            for idx, project in enumerate(self.projects):
+                if project.id == old_default_id:
+                    self._refresh_menu_entry(idx)
+                    break
+
+        self._refresh_menu_entry(selected_project_idx)
 
     def _show_select_project_menu(self) -> int | Literal["q"] | None:
         """Displays the project selection menu and returns either
         - the index of the selected project
         - "q" if the user chooses to save and quit
         - None if the user presses Esc to exit without saving"""
-        select_project_items: list[str | None] = [
-            self._project_menu_str(idx) for idx in range(len(self.projects))
-        ]
-
-        select_project_items.append(None)
-        select_project_items.append("[q] Save and quit")
+        if self._menu_entries is None:
+            self._menu_entries = [self._project_menu_str(idx) for idx in range(len(self.projects))]
+            self._menu_entries.append(None)
+            self._menu_entries.append("[q] Save and quit")
+        select_project_items = self._menu_entries
 
         terminal_menu_projects = TerminalMenu(
             menu_entries=select_project_items,
@@ -436,17 +497,17 @@ def handle_projects() -> None:
     old_config: Config = _load_config()
     new_projects: list[Project] = _fetch_projects()
 
-    # Merge API projects with existing config projects/aliases
+    # Merge API projects with existing config projects/aliases,
+    # checking in the same pass whether the default project still exists
+    default_id = old_config.default_project_id
+    default_project_still_exists = False
     for new_project in new_projects:
         old_project = old_config.projects.get(new_project.id)
         if old_project:
             new_project.alias = old_project.alias  # Keep existing alias
-
-    # Check if default project still exists
-    default_project_still_exists = old_config.default_project_id and any(
-        p.id == old_config.default_project_id for p in new_projects
-    )
-    new_default_id = old_config.default_project_id if default_project_still_exists else None
+        if default_id and new_project.id == default_id:
+            default_project_still_exists = True
+    new_default_id = default_id if default_project_still_exists else None
 
     new_config = ProjectMenu(
         projects=new_projects,
@@ -483,13 +544,12 @@ def handle_start(description: str, project: str, billable: bool) -> None:
 
     start_time = _get_current_utc_time()
     rounded_start_time = _round_time_down(start_time)
-    start_time_iso = _format_iso(rounded_start_time)
 
     payload = {
         "description": description,
         "workspace_id": project.workspace_id,
         "project_id": project.id,  # Can be None
-        "start": start_time_iso,
+        "start": _format_iso(rounded_start_time),
         "duration": -1,  # Indicates a running timer
         "created_with": "toggl-cli-script",
         "billable": billable and project.billable,
@@ -613,10 +673,8 @@ def handle_end() -> None:
             end_time_rounded = end_time_rounded_down
             print(f"Note: Rounding end time ({end_time_actual_local}) DOWN.")
 
-        final_end_time_iso = _format_iso(end_time_rounded)
-
         # Use the PUT method to update the existing time entry with stop time
-        payload = {"stop": final_end_time_iso, "workspace_id": task.workspace_id}
+        payload = {"stop": _format_iso(end_time_rounded), "workspace_id": task.workspace_id}
         end_time_display = end_time_rounded.astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
         print(f"Stopping task at calculated time: {end_time_display}")
 